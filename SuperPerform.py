@@ -8,7 +8,11 @@ Step 2: Fundamental Screening (Earnings/Sales Acceleration, Margins, Volatility)
 import yfinance as yf
 import pandas as pd
 import numpy as np
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import io
+import sys
 import warnings
 import json
 import re
@@ -25,31 +29,240 @@ except ImportError:
     HAS_WEB_SCRAPING = False
     print("WARNING: requests or beautifulsoup4 not installed. Install with: pip install requests beautifulsoup4")
 
+try:
+    import pyarrow  # noqa: F401 - pandas parquet engine
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+try:
+    import requests_cache
+    HAS_REQUESTS_CACHE = True
+except ImportError:
+    requests_cache = None
+    HAS_REQUESTS_CACHE = False
+
+try:
+    from tqdm import tqdm
+    HAS_TQDM = True
+except ImportError:
+    tqdm = None
+    HAS_TQDM = False
+
+try:
+    import lxml  # noqa: F401 - faster BeautifulSoup backend
+    BS4_PARSER = 'lxml'
+except ImportError:
+    BS4_PARSER = 'html.parser'
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
 warnings.filterwarnings('ignore')
 
 # Lightweight caches to reduce repeated API calls
 _TICKER_CACHE = {}
 _HISTORY_CACHE = {}
 
+# On-disk price cache (Parquet) shared across runs
+PRICE_CACHE_DIR = Path(__file__).parent / "cache" / "prices"
+
+# Shared HTTP session (keep-alive; cached on disk when requests_cache is installed)
+_HTTP_SESSION = None
+
+
+def get_http_session():
+    """Get the shared HTTP session, creating it on first use."""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None and requests is not None:
+        if HAS_REQUESTS_CACHE:
+            cache_dir = Path(__file__).parent / "cache"
+            try:
+                cache_dir.mkdir(exist_ok=True)
+                _HTTP_SESSION = requests_cache.CachedSession(
+                    str(cache_dir / "http_cache"),
+                    backend='sqlite',
+                    expire_after=CACHE_HOURS * 3600,
+                    allowable_methods=('GET',)
+                )
+            except Exception:
+                _HTTP_SESSION = requests.Session()
+        else:
+            _HTTP_SESSION = requests.Session()
+    return _HTTP_SESSION
+
+
+def _json_loads(data):
+    """Parse JSON bytes/str via orjson when installed, stdlib otherwise."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj, default=None):
+    """Serialize to JSON bytes via orjson when installed, stdlib otherwise."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=default)
+    return json.dumps(obj, default=default).encode('utf-8')
+
+
+class _ProgressPrinter:
+    """Per-ticker progress: one tqdm bar on stderr when installed, numbered prints otherwise."""
+
+    def __init__(self, total, desc):
+        self.total = total
+        self.count = 0
+        self.bar = tqdm(total=total, desc=desc, file=sys.stderr) if HAS_TQDM else None
+
+    def step(self, label, status):
+        self.count += 1
+        if self.bar is not None:
+            self.bar.update(1)
+            self.bar.set_postfix_str(f"{label} {status}")
+        else:
+            print(f"[{self.count}/{self.total}] {label} {status}")
+
+    def close(self):
+        if self.bar is not None:
+            self.bar.close()
+
 
 def get_ticker_obj(ticker):
     """Get cached yfinance Ticker object."""
     ticker = ticker.upper().strip()
     if ticker not in _TICKER_CACHE:
-        _TICKER_CACHE[ticker] = yf.Ticker(ticker)
+        _TICKER_CACHE[ticker] = yf.Ticker(ticker, session=get_http_session())
     return _TICKER_CACHE[ticker]
 
 
+def _price_cache_path(ticker, period):
+    return PRICE_CACHE_DIR / f"{ticker}_{period}.parquet"
+
+
+_PRICE_FLOAT_COLUMNS = ['Open', 'High', 'Low', 'Close']
+_PRICE_KEEP_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _normalize_history(df):
+    """Keep only OHLCV and downcast prices to float32 to cut memory and disk."""
+    if df is None:
+        return pd.DataFrame()
+    keep = [col for col in _PRICE_KEEP_COLUMNS if col in df.columns]
+    if keep:
+        df = df[keep].copy()
+    for col in _PRICE_FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(np.float32)
+    return df
+
+
+def _load_cached_history(ticker, period):
+    """Load price history from the on-disk Parquet cache if still fresh."""
+    if not HAS_PARQUET:
+        return None
+
+    cache_file = _price_cache_path(ticker, period)
+    if not cache_file.exists():
+        return None
+
+    try:
+        age_hours = (time.time() - cache_file.stat().st_mtime) / 3600
+        if age_hours >= PRICE_CACHE_HOURS:
+            return None
+        return pd.read_parquet(cache_file)
+    except Exception:
+        return None
+
+
+def _save_cached_history(ticker, period, df):
+    """Persist price history to the on-disk Parquet cache (best effort)."""
+    if not HAS_PARQUET or df is None or df.empty:
+        return
+
+    try:
+        PRICE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(_price_cache_path(ticker, period))
+    except Exception:
+        pass
+
+
+# Approximate trading days per period; shorter periods are sliced off cached 1y data
+_PERIOD_TRADING_DAYS = {'3mo': 63, '6mo': 126}
+
+
 def get_price_history(ticker, period="1y"):
     """Get cached price history and return a copy for safe mutation."""
     ticker = ticker.upper().strip()
     key = (ticker, period)
     if key not in _HISTORY_CACHE:
-        stock = get_ticker_obj(ticker)
-        history = stock.history(period=period)
-        _HISTORY_CACHE[key] = history if history is not None else pd.DataFrame()
+        # A shorter window is a suffix of the 1y frame we batch-download anyway,
+        # so serve it from that cache instead of making a second request
+        days = _PERIOD_TRADING_DAYS.get(period)
+        if days is not None and (ticker, "1y") in _HISTORY_CACHE:
+            full = _HISTORY_CACHE[(ticker, "1y")]
+            if len(full) >= days:
+                _HISTORY_CACHE[key] = full.iloc[-days:]
+                return _HISTORY_CACHE[key].copy()
+
+        history = _load_cached_history(ticker, period)
+        if history is None:
+            stock = get_ticker_obj(ticker)
+            history = _normalize_history(stock.history(period=period))
+            _save_cached_history(ticker, period, history)
+        _HISTORY_CACHE[key] = history
     return _HISTORY_CACHE[key].copy()
 
+
+def prefetch_price_histories(tickers, period="1y"):
+    """
+    Batch-download price history for many tickers into the shared cache.
+    One yf.download call per batch replaces hundreds of per-ticker requests;
+    tickers that fail here simply fall back to get_price_history later.
+    """
+    missing = []
+    for ticker in dict.fromkeys(t.upper().strip() for t in tickers):
+        if (ticker, period) in _HISTORY_CACHE:
+            continue
+        history = _load_cached_history(ticker, period)
+        if history is not None:
+            _HISTORY_CACHE[(ticker, period)] = history
+        else:
+            missing.append(ticker)
+
+    for start in range(0, len(missing), PRICE_DOWNLOAD_BATCH):
+        batch = missing[start:start + PRICE_DOWNLOAD_BATCH]
+        try:
+            data = yf.download(
+                batch,
+                period=period,
+                group_by='ticker',
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+                session=get_http_session()
+            )
+        except Exception:
+            continue
+
+        if data is None or data.empty:
+            continue
+
+        for ticker in batch:
+            try:
+                history = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+                history = history.dropna(how='all')
+            except (KeyError, IndexError):
+                continue
+            if history.empty:
+                continue
+            history = _normalize_history(history)
+            _HISTORY_CACHE[(ticker, period)] = history
+            _save_cached_history(ticker, period, history)
+
 # ============================================================================
 # CONFIGURATION - Edit this section to customize
 # ============================================================================
@@ -107,11 +320,89 @@ MAX_SECTOR_CONCENTRATION = 40   # Warn if >40% of picks in one sector
 USE_FINVIZ_SCRAPER = True   # Set False to use hardcoded STOCK_LIST instead
 MAX_PAGES = 5               # Number of Finviz pages to scrape (v=411: ~1000 stocks/page)
 CACHE_HOURS = 24            # Hours to cache Finviz results before re-scraping
+FINVIZ_FETCH_WORKERS = 4    # Concurrent page fetches after page 1 reveals the total
+
+# Price Data Cache Settings
+PRICE_CACHE_HOURS = 24      # Hours to cache price history on disk (requires pyarrow)
+PRICE_DOWNLOAD_BATCH = 200  # Tickers per batched yf.download request
+FUNDAMENTALS_CACHE_HOURS = 24   # Hours to cache income statements / info on disk
+FUNDAMENTALS_QUARTER_LAG_DAYS = 105  # Next quarter end (~92d) + minimum reporting lag
+
+# Concurrency Settings
+MAX_FETCH_WORKERS = 8       # Threads for warming yfinance caches (IO-bound)
+
+# Output Settings
+WRITE_PARQUET = False       # Also write .parquet copies of the CSVs (requires pyarrow)
 
 # ============================================================================
 # FINVIZ SCRAPER
 # ============================================================================
 
+# Fast-path ticker extraction: every screener row links to quote.ashx?t=...
+_QUOTE_LINK_RE = re.compile(r"quote\.ashx\?t=([A-Z][A-Z0-9.\-]*)")
+
+# Ticker symbol shapes and the onclick fallback used by the BS4 parsers
+_TICKER_SYMBOL_RE = re.compile(r"[A-Z][A-Z0-9.\-]*")
+_ONCLICK_TICKER_RE = re.compile(r"t=([A-Z][A-Z0-9.\-]*)")
+
+# Result count in the page header, e.g. "#1 / 4224 Total"
+_TOTAL_COUNT_RE = re.compile(r"#\s*1\s*/\s*([\d,]+)\s+Total")
+
+# Base URL for Finviz screener
+# Filters: 30%+ above 52w low, price > 200MA, 50MA > 200MA
+_FINVIZ_SCREENER_URL = "https://finviz.com/screener.ashx?v=411&f=ta_highlow52w_a30h,ta_sma200_pa,ta_sma50_sa200&ft=4"
+
+_FINVIZ_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def _screener_page_url(page):
+    # Finviz v=411 pagination uses r=1,1001,2001,...
+    start_row = page * 1000 + 1
+    return _FINVIZ_SCREENER_URL if start_row == 1 else f"{_FINVIZ_SCREENER_URL}&r={start_row}"
+
+
+def _fetch_screener_page(session, page):
+    """Fetch one screener page; returns raw HTML or raises."""
+    response = session.get(_screener_page_url(page), headers=_FINVIZ_HEADERS, timeout=10)
+    response.raise_for_status()
+    return response.text
+
+
+def _parse_screener_tickers(html):
+    """Extract tickers from one screener page (regex fast path, BS4 fallback)."""
+    # Fast path: one compiled-regex sweep over the raw HTML for
+    # quote.ashx?t=... links — no DOM tree needed
+    page_tickers = [m.group(1) for m in _QUOTE_LINK_RE.finditer(html)]
+
+    # Fallback parsers (BeautifulSoup) in case the markup changes
+    if not page_tickers:
+        soup = BeautifulSoup(html, BS4_PARSER)
+
+        # Current Finviz screener layout
+        for link in soup.select('a.screener-link-primary'):
+            ticker = link.get_text(strip=True).upper()
+            if _TICKER_SYMBOL_RE.fullmatch(ticker):
+                page_tickers.append(ticker)
+
+        # Older/alternate Finviz markup
+        if not page_tickers:
+            ticker_cells = soup.find_all('td', class_='screener_tickers')
+            for cell in ticker_cells:
+                spans = cell.find_all('span')
+                for span in spans:
+                    onclick = span.get('onclick')
+                    onclick_str = str(onclick) if onclick is not None else ""
+                    if 'quote.ashx?t=' in onclick_str:
+                        match = _ONCLICK_TICKER_RE.search(onclick_str)
+                        if match:
+                            page_tickers.append(match.group(1))
+
+    # Deduplicate while preserving order
+    return list(dict.fromkeys(page_tickers))
+
+
 def scrape_finviz_screener(max_pages=MAX_PAGES):
     """
     Scrape stock tickers from Finviz screener
@@ -122,106 +413,88 @@ def scrape_finviz_screener(max_pages=MAX_PAGES):
         print("Install with: pip install requests beautifulsoup4")
         return None
 
-    # Base URL for Finviz screener
-    # Filters: 30%+ above 52w low, price > 200MA, 50MA > 200MA
-    base_url = "https://finviz.com/screener.ashx?v=411&f=ta_highlow52w_a30h,ta_sma200_pa,ta_sma50_sa200&ft=4"
+    session = get_http_session()
+    print(f"Scraping Finviz screener (max {max_pages} pages)...")
 
-    tickers = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    # First page is fetched alone: it reveals the total result count
+    try:
+        print("  Fetching page 1...", end=" ")
+        html = _fetch_screener_page(session, 0)
+    except Exception as e:
+        print(f"✗ Error fetching page 1: {e}")
+        return None
 
-    print(f"Scraping Finviz screener (max {max_pages} pages)...")
+    try:
+        tickers = _parse_screener_tickers(html)
+    except Exception as e:
+        print(f"✗ Error parsing page 1: {e}")
+        return None
+
+    if not tickers:
+        print("ERROR: No tickers found")
+        return None
+
+    seen = set(tickers)
 
-    detected_total = None
+    # Detect total result count from page header, e.g. "#1 / 4224 Total"
     detected_pages = None
-    warned_page_limit = False
+    total_match = _TOTAL_COUNT_RE.search(html)
+    if total_match:
+        detected_total = int(total_match.group(1).replace(',', ''))
+        detected_pages = max(1, int(np.ceil(detected_total / 1000)))
+        print(f"(detected total: {detected_total}, approx pages: {detected_pages})", end=" ")
 
-    for page in range(max_pages):
-        # Finviz v=411 pagination uses r=1,1001,2001,...
-        start_row = page * 1000 + 1
-        url = base_url if start_row == 1 else f"{base_url}&r={start_row}"
+    print(f"✓ Found {len(tickers)} tickers")
 
-        try:
-            print(f"  Fetching page {page + 1}...", end=" ")
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            page_tickers = []
-
-            # Primary parser: current Finviz screener layout
-            for link in soup.select('a.screener-link-primary'):
-                ticker = link.get_text(strip=True).upper()
-                if re.fullmatch(r"[A-Z][A-Z0-9.\-]*", ticker):
-                    page_tickers.append(ticker)
-
-            # Detect total result count from page header, e.g. "#1 / 4224 Total"
-            if detected_total is None:
-                text_snapshot = soup.get_text(" ", strip=True)
-                total_match = re.search(r"#\s*1\s*/\s*([\d,]+)\s+Total", text_snapshot)
-                if total_match:
-                    detected_total = int(total_match.group(1).replace(',', ''))
-                    detected_pages = max(1, int(np.ceil(detected_total / 1000)))
-                    print(f"(detected total: {detected_total}, approx pages: {detected_pages})", end=" ")
-
-            # Fallback parser for older/alternate Finviz markup
-            if not page_tickers:
-                ticker_cells = soup.find_all('td', class_='screener_tickers')
-                for cell in ticker_cells:
-                    spans = cell.find_all('span')
-                    for span in spans:
-                        onclick = span.get('onclick')
-                        onclick_str = str(onclick) if onclick is not None else ""
-                        if 'quote.ashx?t=' in onclick_str:
-                            match = re.search(r"t=([A-Z][A-Z0-9.\-]*)", onclick_str)
-                            if match:
-                                page_tickers.append(match.group(1))
-
-            # Deduplicate while preserving order
-            page_tickers = list(dict.fromkeys(page_tickers))
+    if detected_pages and max_pages < detected_pages:
+        print(f"  [!] max_pages={max_pages} < detected pages={detected_pages}; increase MAX_PAGES for full coverage")
+
+    # Remaining pages are independent — fetch them concurrently over the
+    # shared keep-alive session and process results in page order
+    last_page = min(max_pages, detected_pages) if detected_pages else max_pages
+    remaining_pages = list(range(1, last_page))
+
+    if remaining_pages:
+        def _fetch(page):
+            try:
+                return _fetch_screener_page(session, page)
+            except Exception as e:
+                print(f"  ✗ Error fetching page {page + 1}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=FINVIZ_FETCH_WORKERS) as executor:
+            pages_html = list(executor.map(_fetch, remaining_pages))
+
+        for page, page_html in zip(remaining_pages, pages_html):
+            if page_html is None:
+                # Match the old sequential behavior: stop pagination on error
+                break
+
+            page_tickers = _parse_screener_tickers(page_html)
             if not page_tickers:
-                print(f"No more results (page {page + 1})")
+                print(f"  No more results (page {page + 1})")
                 break
 
             new_count = 0
             for ticker in page_tickers:
-                if ticker not in tickers:
+                if ticker not in seen:
+                    seen.add(ticker)
                     tickers.append(ticker)
                     new_count += 1
 
-            print(f"✓ Found {new_count} new tickers (total: {len(tickers)})")
-
-            if detected_pages and (page + 1) >= detected_pages:
-                break
-
-            if detected_pages and max_pages < detected_pages and not warned_page_limit:
-                print(f"  [!] max_pages={max_pages} < detected pages={detected_pages}; increase MAX_PAGES for full coverage")
-                warned_page_limit = True
-
-            # Be nice to Finviz - add small delay between pages
-            if page < max_pages - 1:
-                time.sleep(1)
+            print(f"  Page {page + 1}: ✓ {new_count} new tickers (total: {len(tickers)})")
 
-        except Exception as e:
-            if requests is not None and isinstance(e, requests.exceptions.RequestException):
-                print(f"✗ Error fetching page {page + 1}: {e}")
-                if page == 0:
-                    # If first page fails, this is a critical error
-                    return None
-                # If later pages fail, just stop pagination
-                break
+    print(f"✓ Scraped {len(tickers)} unique tickers from Finviz")
+    return tickers
 
-            print(f"✗ Error parsing page {page + 1}: {e}")
-            break
 
-    if not tickers:
-        print("ERROR: No tickers found")
-        return None
+def _clean_tickers(tickers):
+    """Normalize, drop empties, and dedupe tickers via vectorized string ops."""
+    s = pd.Series(list(tickers), dtype=object)
+    s = s[s.map(type).eq(str)].str.strip().str.upper()
+    s = s[s.str.len().gt(0)]
+    return s.drop_duplicates().tolist()
 
-    print(f"✓ Scraped {len(tickers)} unique tickers from Finviz")
-    return tickers
 
 def get_stock_list():
     """
@@ -233,21 +506,19 @@ def get_stock_list():
     # If not using scraper, return hardcoded list
     if not USE_FINVIZ_SCRAPER:
         print("Using hardcoded STOCK_LIST")
-        return list(dict.fromkeys([t.upper().strip() for t in STOCK_LIST if isinstance(t, str) and t.strip()]))
+        return _clean_tickers(STOCK_LIST)
 
     # Check cache
     if cache_file.exists():
         try:
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
+            cache_data = _json_loads(cache_file.read_bytes())
 
             cached_time = datetime.fromisoformat(cache_data['timestamp'])
             cache_age = datetime.now() - cached_time
             cache_age_hours = cache_age.total_seconds() / 3600
 
             if cache_age_hours < CACHE_HOURS:
-                tickers = cache_data['tickers']
-                tickers = list(dict.fromkeys([t.upper().strip() for t in tickers if isinstance(t, str) and t.strip()]))
+                tickers = _clean_tickers(cache_data['tickers'])
 
                 cache_max_pages = cache_data.get('max_pages', MAX_PAGES)
                 cache_parser_version = cache_data.get('parser_version', 1)
@@ -282,22 +553,24 @@ def get_stock_list():
             'max_pages': MAX_PAGES,
             'parser_version': 2
         }
-        with open(cache_file, 'w') as f:
-            json.dump(cache_data, f, indent=2)
+        cache_file.write_bytes(_json_dumps(cache_data))
         print(f"✓ Cached results to {cache_file}")
     except Exception as e:
         print(f"Warning: Could not save cache: {e}")
 
-    return list(dict.fromkeys([t.upper().strip() for t in tickers if isinstance(t, str) and t.strip()]))
+    return _clean_tickers(tickers)
 
 # ============================================================================
 # RS CALCULATION FUNCTIONS
 # ============================================================================
 
-def calculate_ibd_rs(ticker, spy_data):
+def calculate_ibd_rs(ticker, spy_close):
     """
     Calculate IBD-style Relative Strength for a stock
     Formula: 0.4*(3mo) + 0.2*(6mo) + 0.2*(9mo) + 0.2*(12mo)
+
+    spy_close is the benchmark close series as a NumPy array, extracted
+    once by the caller rather than re-read per ticker.
     """
     try:
         df = get_price_history(ticker, period="1y")
@@ -305,41 +578,32 @@ def calculate_ibd_rs(ticker, spy_data):
         if len(df) < MIN_TRADING_DAYS:
             return None, f"Insufficient data ({len(df)} days, need {MIN_TRADING_DAYS}+)"
 
-        current_price = df['Close'].iloc[-1]
+        close = df['Close'].to_numpy(dtype=np.float64)
+        current_price = close[-1]
+        spy_current_price = spy_close[-1]
 
-        # Calculate returns for different periods (trading days)
-        periods = {
-            '3mo': min(63, len(df)),
-            '6mo': min(126, len(df)),
-            '9mo': min(189, len(df)),
-            '12mo': min(252, len(df), len(spy_data))
-        }
+        n = len(close)
+        m = len(spy_close)
 
-        weights = {
-            '3mo': 0.4,
-            '6mo': 0.2,
-            '9mo': 0.2,
-            '12mo': 0.2
-        }
+        # Lookback days per period, clamped to available stock history
+        period_names = ('3mo', '6mo', '9mo', '12mo')
+        period_days = np.array([min(63, n), min(126, n), min(189, n), min(252, n, m)])
+        weights = np.array([0.4, 0.2, 0.2, 0.2])
 
-        returns = {}
-        rs_score = 0
+        # All four period returns in one pass of array indexing
+        valid = (period_days > 0) & (period_days <= m)
+        idx_stock = n - period_days
+        idx_spy = np.clip(m - period_days, 0, m - 1)
 
-        for period_name, days in periods.items():
-            if len(df) >= days and len(spy_data) >= days and days > 0:
-                past_price = df['Close'].iloc[-days]
-                stock_return = ((current_price - past_price) / past_price) * 100
+        stock_returns = (current_price - close[idx_stock]) / close[idx_stock] * 100
+        spy_returns = (spy_current_price - spy_close[idx_spy]) / spy_close[idx_spy] * 100
+        relative_returns = stock_returns - spy_returns
 
-                spy_past_price = spy_data['Close'].iloc[-days]
-                spy_current_price = spy_data['Close'].iloc[-1]
-                spy_return = ((spy_current_price - spy_past_price) / spy_past_price) * 100
-
-                relative_return = stock_return - spy_return
-                rs_score += weights[period_name] * relative_return
-
-                returns[period_name] = stock_return
-            else:
-                returns[period_name] = None
+        rs_score = float(np.sum(np.where(valid, weights * relative_returns, 0.0)))
+        returns = {
+            name: float(stock_returns[i]) if valid[i] else None
+            for i, name in enumerate(period_names)
+        }
 
         return {
             'rs_score': rs_score,
@@ -353,19 +617,31 @@ def calculate_ibd_rs(ticker, spy_data):
 # STAGE ANALYSIS FUNCTIONS
 # ============================================================================
 
+def _rolling_mean(values, window):
+    """Rolling mean via cumulative sums; NaN-padded to match input length."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
 def calculate_ma_slope(ma_values, lookback=20):
-    """Calculate if MA is trending up"""
-    if len(ma_values) < lookback:
+    """Calculate if MA is trending up. Accepts a NumPy array (NaNs ignored)."""
+    ma = np.asarray(ma_values, dtype=np.float64)
+    ma = ma[~np.isnan(ma)]
+    if len(ma) < lookback:
         return None
 
-    recent_window = ma_values.iloc[-5:]
-    older_window = ma_values.iloc[-lookback:-15]
-    if len(older_window) == 0:
+    older_window = ma[-lookback:-15]
+    if older_window.size == 0:
         return None
 
-    recent_avg = recent_window.mean()
+    recent_avg = ma[-5:].mean()
     older_avg = older_window.mean()
-    if pd.isna(recent_avg) or pd.isna(older_avg) or older_avg == 0:
+    if np.isnan(recent_avg) or np.isnan(older_avg) or older_avg == 0:
         return None
 
     return (recent_avg - older_avg) / older_avg * 100
@@ -419,31 +695,33 @@ def analyze_stage(ticker, rs_rating):
         if len(df) < 200:
             return None, "Insufficient data for MA calculation"
 
-        # Calculate moving averages
-        df['MA_50'] = df['Close'].rolling(window=50).mean()
-        df['MA_150'] = df['Close'].rolling(window=150).mean()
-        df['MA_200'] = df['Close'].rolling(window=200).mean()
+        # Calculate moving averages in one pass over the close array
+        close = df['Close'].to_numpy(dtype=np.float64)
+        ma_50_arr = _rolling_mean(close, 50)
+        ma_150_arr = _rolling_mean(close, 150)
+        ma_200_arr = _rolling_mean(close, 200)
 
         # Get current values
-        current_price = df['Close'].iloc[-1]
-        ma_50 = df['MA_50'].iloc[-1]
-        ma_150 = df['MA_150'].iloc[-1]
-        ma_200 = df['MA_200'].iloc[-1]
+        current_price = close[-1]
+        ma_50 = ma_50_arr[-1]
+        ma_150 = ma_150_arr[-1]
+        ma_200 = ma_200_arr[-1]
 
-        # 52-week high/low
-        week_52_high = df['High'].max()
-        week_52_low = df['Low'].min()
+        # 52-week high/low from the raw arrays (single scan each)
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        week_52_high = high.max()
+        week_52_low = low.min()
 
         # Calculate MA slope
-        ma_50_slope = calculate_ma_slope(df['MA_50'].dropna())
-        ma_150_slope = calculate_ma_slope(df['MA_150'].dropna())
-        ma_200_slope = calculate_ma_slope(df['MA_200'].dropna())
+        ma_50_slope = calculate_ma_slope(ma_50_arr)
+        ma_150_slope = calculate_ma_slope(ma_150_arr)
+        ma_200_slope = calculate_ma_slope(ma_200_arr)
 
         # Additional trend-quality metrics for false-positive reduction
         pct_above_ma_50 = ((current_price - ma_50) / ma_50 * 100) if ma_50 else None
-        high_values = df['High'].values
-        high_positions = np.where(high_values == week_52_high)[0]
-        days_since_52w_high = int(len(df) - 1 - high_positions[-1]) if len(high_positions) > 0 else None
+        # argmax over the reversed highs gives the distance to the last 52w-high bar
+        days_since_52w_high = int(high[::-1].argmax())
 
         pct_above_52w_low = ((current_price - week_52_low) / week_52_low * 100)
         pct_from_52w_high = ((week_52_high - current_price) / week_52_high * 100)
@@ -505,6 +783,15 @@ def analyze_stage(ticker, rs_rating):
 # ENTRY TIMING ANALYSIS (NEW)
 # ============================================================================
 
+def _ema_last(values, span):
+    """Last value of an adjust=False EMA, without materializing the series."""
+    alpha = 2.0 / (span + 1)
+    ema = values[0]
+    for value in values[1:]:
+        ema = alpha * value + (1 - alpha) * ema
+    return float(ema)
+
+
 def analyze_entry_timing(df):
     """
     Analyze if stock is in a buyable pullback zone near 10/21 EMA.
@@ -513,13 +800,11 @@ def analyze_entry_timing(df):
     if len(df) < 21:
         return None
 
-    # Calculate EMAs
-    df['EMA_10'] = df['Close'].ewm(span=10, adjust=False).mean()
-    df['EMA_21'] = df['Close'].ewm(span=21, adjust=False).mean()
-
-    current_price = df['Close'].iloc[-1]
-    ema_10 = df['EMA_10'].iloc[-1]
-    ema_21 = df['EMA_21'].iloc[-1]
+    # Calculate EMAs (only the last value is used downstream)
+    close = df['Close'].to_numpy(dtype=np.float64)
+    current_price = close[-1]
+    ema_10 = _ema_last(close, 10)
+    ema_21 = _ema_last(close, 21)
 
     # Calculate distance from EMAs
     pct_above_ema_10 = ((current_price - ema_10) / ema_10) * 100
@@ -559,24 +844,27 @@ def analyze_volume(df):
     if len(df) < 50:
         return None
 
+    volume = df['Volume'].to_numpy(dtype=np.float64)
+    close = df['Close'].to_numpy(dtype=np.float64)
+
     # 50-day average volume
-    avg_volume_50d = df['Volume'].tail(50).mean()
+    avg_volume_50d = volume[-50:].mean()
 
     # Recent 5-day average volume
-    recent_volume = df['Volume'].tail(5).mean()
+    recent_volume = volume[-5:].mean()
 
     # Volume ratio
     volume_ratio = recent_volume / avg_volume_50d if avg_volume_50d > 0 else 1.0
 
-    # Up/Down volume ratio (last 20 days)
-    recent_20 = df.tail(20).copy()
-    recent_20['Change'] = recent_20['Close'].diff()
+    # Up/Down volume ratio (last 20 days); diff leaves 19 changes
+    changes = np.diff(close[-20:])
+    recent_volume_20 = volume[-19:]
 
-    up_days = recent_20[recent_20['Change'] > 0]
-    down_days = recent_20[recent_20['Change'] < 0]
+    up_volumes = recent_volume_20[changes > 0]
+    down_volumes = recent_volume_20[changes < 0]
 
-    avg_up_volume = up_days['Volume'].mean() if len(up_days) > 0 else 0
-    avg_down_volume = down_days['Volume'].mean() if len(down_days) > 0 else 1
+    avg_up_volume = up_volumes.mean() if len(up_volumes) > 0 else 0
+    avg_down_volume = down_volumes.mean() if len(down_volumes) > 0 else 1
 
     up_down_ratio = avg_up_volume / avg_down_volume if avg_down_volume > 0 else 1.0
 
@@ -653,6 +941,44 @@ def _extract_earnings_dates(calendar_data):
     return sorted(set(dates))
 
 
+_EARNINGS_CACHE = {}
+
+
+def _get_earnings_dates(ticker):
+    """Get normalized earnings dates, cached in memory and on disk for a day."""
+    ticker = ticker.upper().strip()
+    if ticker in _EARNINGS_CACHE:
+        return _EARNINGS_CACHE[ticker]
+
+    cache_file = FUND_CACHE_DIR / f"{ticker}_earnings.json"
+    if cache_file.exists():
+        try:
+            payload = _json_loads(cache_file.read_bytes())
+            if _fundamentals_cache_fresh(payload) and isinstance(payload.get('dates'), list):
+                dates = [pd.to_datetime(d).date() for d in payload['dates']]
+                _EARNINGS_CACHE[ticker] = dates
+                return dates
+        except Exception:
+            pass
+
+    try:
+        dates = _extract_earnings_dates(get_ticker_obj(ticker).calendar)
+    except Exception:
+        dates = []
+
+    _EARNINGS_CACHE[ticker] = dates
+    if dates:
+        try:
+            FUND_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_file.write_bytes(_json_dumps({
+                'timestamp': datetime.now().isoformat(),
+                'dates': [d.isoformat() for d in dates]
+            }))
+        except Exception:
+            pass
+    return dates
+
+
 def get_earnings_warning(ticker):
     """
     Check upcoming earnings date and flag if within danger/caution zone.
@@ -666,8 +992,7 @@ def get_earnings_warning(ticker):
     - N/A: No earnings data (ETFs, funds, etc.)
     """
     try:
-        stock = get_ticker_obj(ticker)
-        earnings_dates = _extract_earnings_dates(stock.calendar)
+        earnings_dates = _get_earnings_dates(ticker)
 
         if not earnings_dates:
             return {
@@ -734,10 +1059,11 @@ def analyze_market_regime(spy_data):
             'regime_warning': True
         }
 
-    # Calculate MAs
-    spy_ma_50 = spy_data['Close'].rolling(window=50).mean().iloc[-1]
-    spy_ma_200 = spy_data['Close'].rolling(window=200).mean().iloc[-1]
-    spy_price = spy_data['Close'].iloc[-1]
+    # Calculate MAs: the last rolling value is just the mean of the tail window
+    close = spy_data['Close'].to_numpy(dtype=np.float64)
+    spy_ma_50 = float(close[-50:].mean())
+    spy_ma_200 = float(close[-200:].mean())
+    spy_price = float(close[-1])
 
     # Determine regime
     if spy_price > spy_ma_50 and spy_ma_50 > spy_ma_200:
@@ -768,8 +1094,7 @@ def get_sector(ticker):
     Returns sector string or 'Unknown'.
     """
     try:
-        stock = get_ticker_obj(ticker)
-        info = stock.info
+        info = get_ticker_info(ticker)
         sector = info.get('sector', 'Unknown') if isinstance(info, dict) else 'Unknown'
         return sector or 'Unknown'
     except Exception:
@@ -790,13 +1115,12 @@ def format_earnings_display(earn_data):
     if flag == "N/A":
         return "N/A"
     elif flag == "REPORTED":
-        # Show last earnings date in MM/DD format
+        # Show last earnings date in MM/DD format; we wrote it as '%Y-%m-%d',
+        # so slicing beats a strptime round-trip
         if last_date:
             try:
-                from datetime import datetime as dt
-                d = dt.strptime(last_date, '%Y-%m-%d')
-                return f"Rpt:{d.month}/{d.day}"
-            except:
+                return f"Rpt:{int(last_date[5:7])}/{int(last_date[8:10])}"
+            except (ValueError, IndexError):
                 return "Rpt:--"
         return "Rpt:--"
     elif flag == "DANGER":
@@ -806,23 +1130,42 @@ def format_earnings_display(earn_data):
     else:
         return flag
 
+def _save_results_frame(df, stem, timestamp):
+    """Write a results frame to CSV, plus a Parquet copy when WRITE_PARQUET is on."""
+    filename = f"{stem}_{timestamp}.csv"
+    df.to_csv(filename, index=False)
+    if WRITE_PARQUET and HAS_PARQUET:
+        try:
+            df.to_parquet(f"{stem}_{timestamp}.parquet", index=False)
+        except Exception:
+            pass
+    return filename
+
+def _format_pick_row(r):
+    """Format one TOP PICKS / WATCHLIST table row, hoisting each lookup once."""
+    analysis = r['analysis']
+    grade = r.get('grade', '?')
+    entry = r.get('entry', {}).get('entry_status', 'N/A')
+    volume = r.get('volume', {}).get('volume_status', 'N/A')
+    earn_str = format_earnings_display(r.get('earnings', {}))
+    sector = r.get('sector', 'Unknown')[:15]
+    return (f"  {r['ticker']:<8} {grade:<6} {analysis['rs_rating']:<4} "
+            f"${analysis['current_price']:<9.2f} {entry:<10} {volume:<8} "
+            f"{earn_str:<10} {sector:<15}")
+
 def calculate_sector_concentration(results):
     """
     Calculate sector breakdown and flag concentration issues.
     Returns dict with sector counts and warnings.
     """
-    sector_counts = {}
     total = len(results)
-
-    for r in results:
-        sector = r.get('sector', 'Unknown')
-        sector_counts[sector] = sector_counts.get(sector, 0) + 1
+    sector_counts = Counter(r.get('sector', 'Unknown') for r in results)
 
     # Calculate percentages and flag concentration
     sector_breakdown = {}
     concentrated_sectors = []
 
-    for sector, count in sorted(sector_counts.items(), key=lambda x: x[1], reverse=True):
+    for sector, count in sector_counts.most_common():
         pct = (count / total * 100) if total > 0 else 0
         sector_breakdown[sector] = {
             'count': count,
@@ -862,6 +1205,106 @@ def is_operating_company(info):
 # STEP 2: FUNDAMENTAL SCREENING (SEPA)
 # ============================================================================
 
+# Fundamentals caches (memory + disk); statements only change quarterly
+FUND_CACHE_DIR = Path(__file__).parent / "cache" / "fundamentals"
+_INCOME_STMT_CACHE = {}
+_INFO_CACHE = {}
+
+
+def _fundamentals_cache_fresh(payload):
+    try:
+        fetched = datetime.fromisoformat(payload['timestamp'])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return (datetime.now() - fetched).total_seconds() / 3600 < FUNDAMENTALS_CACHE_HOURS
+
+
+def _income_stmt_current(stmt):
+    """
+    A cached statement stays valid until the next fiscal quarter could have
+    been reported: quarterly data only changes on earnings dates, not daily.
+    """
+    if stmt is None or stmt.empty or len(stmt.columns) == 0:
+        return False
+    try:
+        latest_quarter = pd.to_datetime(stmt.columns).max()
+    except Exception:
+        return False
+    return (pd.Timestamp.now() - latest_quarter).days < FUNDAMENTALS_QUARTER_LAG_DAYS
+
+
+def get_quarterly_income_stmt(ticker):
+    """Get quarterly income statement, cached in memory and on disk."""
+    ticker = ticker.upper().strip()
+    if ticker in _INCOME_STMT_CACHE:
+        return _INCOME_STMT_CACHE[ticker]
+
+    cache_file = FUND_CACHE_DIR / f"{ticker}_income.json"
+    if cache_file.exists():
+        try:
+            payload = _json_loads(cache_file.read_bytes())
+            stmt = pd.read_json(io.StringIO(payload['income_stmt']), orient='split')
+            stmt.columns = pd.to_datetime(stmt.columns)
+            if _fundamentals_cache_fresh(payload) or _income_stmt_current(stmt):
+                _INCOME_STMT_CACHE[ticker] = stmt
+                return stmt
+        except Exception:
+            pass
+
+    try:
+        stmt = get_ticker_obj(ticker).quarterly_income_stmt
+    except Exception:
+        stmt = None
+    if stmt is None:
+        stmt = pd.DataFrame()
+
+    _INCOME_STMT_CACHE[ticker] = stmt
+    if not stmt.empty:
+        try:
+            FUND_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_file.write_bytes(_json_dumps({
+                'timestamp': datetime.now().isoformat(),
+                'income_stmt': stmt.to_json(orient='split', date_format='iso')
+            }))
+        except Exception:
+            pass
+    return stmt
+
+
+def get_ticker_info(ticker):
+    """Get the yfinance info dict, cached in memory and on disk."""
+    ticker = ticker.upper().strip()
+    if ticker in _INFO_CACHE:
+        return _INFO_CACHE[ticker]
+
+    cache_file = FUND_CACHE_DIR / f"{ticker}_info.json"
+    if cache_file.exists():
+        try:
+            payload = _json_loads(cache_file.read_bytes())
+            if _fundamentals_cache_fresh(payload) and isinstance(payload.get('info'), dict):
+                _INFO_CACHE[ticker] = payload['info']
+                return payload['info']
+        except Exception:
+            pass
+
+    try:
+        info = get_ticker_obj(ticker).info or {}
+    except Exception:
+        info = {}
+
+    _INFO_CACHE[ticker] = info
+    if info:
+        try:
+            FUND_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_file.write_bytes(_json_dumps({
+                'timestamp': datetime.now().isoformat(),
+                'info': info
+            }, default=str))
+        except Exception:
+            pass
+    return info
+
+
 def calculate_atr_percent(ticker):
     """Calculate Average True Range as percentage of price"""
     try:
@@ -870,20 +1313,23 @@ def calculate_atr_percent(ticker):
         if len(df) < 20:
             return None
 
-        # Calculate True Range
-        df['H-L'] = df['High'] - df['Low']
-        df['H-PC'] = abs(df['High'] - df['Close'].shift(1))
-        df['L-PC'] = abs(df['Low'] - df['Close'].shift(1))
-        df['TR'] = df[['H-L', 'H-PC', 'L-PC']].max(axis=1)
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+
+        # True Range as one branchless expression; seeding the previous close
+        # with close[0] makes the first bar's TR collapse to High-Low
+        cprev = np.concatenate(([close[0]], close[:-1]))
+        tr = np.maximum(high - low, np.maximum(np.abs(high - cprev), np.abs(low - cprev)))
 
-        # ATR is 14-period average of True Range
-        atr = df['TR'].rolling(window=14).mean().dropna()
-        if atr.empty:
+        # ATR via Wilder's smoothing: EWMA with alpha=1/14, vectorized and
+        # loop-free, and it uses every bar instead of only the last 14
+        atr_value = pd.Series(tr).ewm(alpha=1.0 / 14, adjust=False).mean().iloc[-1]
+        if np.isnan(atr_value):
             return None
 
-        atr_value = atr.iloc[-1]
-        current_price = df['Close'].iloc[-1]
-        if current_price == 0 or pd.isna(current_price):
+        current_price = close[-1]
+        if current_price == 0 or np.isnan(current_price):
             return None
 
         atr_percent = (atr_value / current_price) * 100
@@ -900,20 +1346,17 @@ def calculate_yoy_growth_series(values, max_points=4):
     if not isinstance(values, pd.Series) or len(values) < 5:
         return []
 
-    growth_rates = []
-    max_idx = min(len(values) - 4, max_points)
+    arr = values.to_numpy(dtype=np.float64)
+    max_idx = min(len(arr) - 4, max_points)
 
-    for i in range(max_idx):
-        current_val = values.iloc[i]
-        year_ago_val = values.iloc[i + 4]
+    current = arr[:max_idx]
+    year_ago = arr[4:4 + max_idx]
 
-        if pd.isna(current_val) or pd.isna(year_ago_val) or year_ago_val == 0:
-            continue
-
-        growth = ((current_val - year_ago_val) / abs(year_ago_val)) * 100
-        growth_rates.append(float(growth))
+    valid = ~np.isnan(current) & ~np.isnan(year_ago) & (year_ago != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = ((current - year_ago) / np.abs(year_ago)) * 100
 
-    return growth_rates
+    return [float(g) for g in growth[valid]]
 
 
 def check_acceleration(yoy_growth_rates, min_delta=ACCELERATION_MIN_DELTA):
@@ -924,14 +1367,8 @@ def check_acceleration(yoy_growth_rates, min_delta=ACCELERATION_MIN_DELTA):
     if len(yoy_growth_rates) < 2:
         return 0
 
-    chronological = list(reversed(yoy_growth_rates[:4]))
-    acceleration_count = 0
-
-    for i in range(1, len(chronological)):
-        if (chronological[i] - chronological[i - 1]) >= min_delta:
-            acceleration_count += 1
-
-    return acceleration_count
+    chronological = np.asarray(yoy_growth_rates[:4][::-1], dtype=np.float64)
+    return int((np.diff(chronological) >= min_delta).sum())
 
 
 def count_positive_growth_quarters(yoy_growth_rates, lookback=4):
@@ -945,20 +1382,44 @@ def count_sign_flips(values, lookback=8):
     if not isinstance(values, pd.Series):
         return 0
 
-    recent_values = values.head(lookback).tolist()
-    cleaned = [v for v in recent_values if not pd.isna(v) and v != 0]
+    recent = values.to_numpy(dtype=np.float64)[:lookback]
+    cleaned = recent[~np.isnan(recent) & (recent != 0)]
     if len(cleaned) < 2:
         return 0
 
-    flips = 0
-    prev_sign = 1 if cleaned[0] > 0 else -1
-    for value in cleaned[1:]:
-        curr_sign = 1 if value > 0 else -1
-        if curr_sign != prev_sign:
-            flips += 1
-        prev_sign = curr_sign
+    signs = np.sign(cleaned)
+    return int((signs[1:] != signs[:-1]).sum())
+
+def prefetch_fundamentals(tickers):
+    """
+    Warm yfinance fundamentals caches concurrently before the Step 2 loop.
+    Ticker objects cache their statements, so the serial analysis loop
+    afterwards is pure computation instead of one HTTP round-trip each.
+    """
+    def _warm(ticker):
+        get_quarterly_income_stmt(ticker)
+        get_ticker_info(ticker)
+
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        list(executor.map(_warm, tickers))
+
+
+def prefetch_enhanced_data(tickers):
+    """
+    Warm the caches Step 4 needs (3mo history, earnings calendar, info)
+    concurrently so the enhanced-analysis loop runs off warm caches.
+    """
+    def _warm(ticker):
+        try:
+            get_price_history(ticker, period="3mo")
+        except Exception:
+            pass
+        _get_earnings_dates(ticker)
+        get_ticker_info(ticker)
+
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        list(executor.map(_warm, tickers))
 
-    return flips
 
 def analyze_fundamentals(ticker):
     """
@@ -966,21 +1427,15 @@ def analyze_fundamentals(ticker):
     Returns dict with fundamental metrics and pass/fail for Step 2
     """
     try:
-        stock = get_ticker_obj(ticker)
-
-        info = {}
-        try:
-            info = stock.info or {}
-        except Exception:
-            info = {}
+        info = get_ticker_info(ticker)
 
         is_company, skip_reason = is_operating_company(info)
         if not is_company:
             return None, skip_reason
 
         # Get quarterly income statement (contains both revenue and net income rows)
-        quarterly_income = stock.quarterly_income_stmt
-        if quarterly_income is None or quarterly_income.empty:
+        quarterly_income = get_quarterly_income_stmt(ticker)
+        if quarterly_income.empty:
             return None, "Insufficient quarterly data"
 
         # Get quarterly earnings (try multiple possible field names)
@@ -1072,18 +1527,20 @@ def analyze_fundamentals(ticker):
                 revenue_clean.rename('revenue')
             ], axis=1).dropna()
             margin_df = margin_df[margin_df['revenue'] != 0].sort_index(ascending=False)
+            net_income = margin_df['net_income'].to_numpy(dtype=np.float64)
+            revenue = margin_df['revenue'].to_numpy(dtype=np.float64)
 
             recent_margin = None
             older_margin = None
 
-            if len(margin_df) >= 8:
-                recent_margin = (margin_df['net_income'].iloc[:4] / margin_df['revenue'].iloc[:4]).mean()
-                older_margin = (margin_df['net_income'].iloc[4:8] / margin_df['revenue'].iloc[4:8]).mean()
-            elif len(margin_df) >= 5:
-                recent_margin = margin_df['net_income'].iloc[0] / margin_df['revenue'].iloc[0]
-                older_margin = margin_df['net_income'].iloc[4] / margin_df['revenue'].iloc[4]
+            if len(net_income) >= 8:
+                recent_margin = float((net_income[:4] / revenue[:4]).mean())
+                older_margin = float((net_income[4:8] / revenue[4:8]).mean())
+            elif len(net_income) >= 5:
+                recent_margin = float(net_income[0] / revenue[0])
+                older_margin = float(net_income[4] / revenue[4])
 
-            if recent_margin is not None and older_margin is not None and not pd.isna(recent_margin) and not pd.isna(older_margin):
+            if recent_margin is not None and older_margin is not None and not np.isnan(recent_margin) and not np.isnan(older_margin):
                 results['margin_expansion'] = recent_margin > older_margin
                 results['recent_net_margin'] = recent_margin * 100
                 results['prior_net_margin'] = older_margin * 100
@@ -1169,6 +1626,18 @@ def analyze_fundamentals(ticker):
     except Exception as e:
         return None, str(e)
 
+# Quality-score ladders as sorted edges + point tables for np.searchsorted.
+# 'left' buckets are <= comparisons against the edges, 'right' buckets are >=.
+_PCT_FROM_HIGH_EDGES = np.array([5, 10, 15, 20])
+_PCT_FROM_HIGH_PTS = np.array([30, 25, 15, 5, 0])
+_RS_EDGES = np.array([70, 75, 80, 85])
+_RS_PTS = np.array([0, 10, 15, 20, 25])
+_EARNINGS_GROWTH_EDGES = np.array([15, 25, 50, 100])
+_EARNINGS_GROWTH_PTS = np.array([5, 10, 15, 20, 25])
+_REVENUE_GROWTH_EDGES = np.array([10, 25, 50])
+_REVENUE_GROWTH_PTS = np.array([0, 5, 7, 10])
+
+
 def calculate_quality_score(stage_analysis, fundamentals):
     """
     Calculate quality score (0-100) based on backtest-proven edge factors.
@@ -1185,52 +1654,24 @@ def calculate_quality_score(stage_analysis, fundamentals):
 
     # 1. Distance from 52-week high (30 pts max) - MOST IMPORTANT
     pct_from_high = stage_analysis['pct_from_52w_high']
-    if pct_from_high <= 5:
-        score += 30
-    elif pct_from_high <= 10:
-        score += 25
-    elif pct_from_high <= 15:
-        score += 15
-    elif pct_from_high <= 20:
-        score += 5
-    # else: 0 points
+    score += int(_PCT_FROM_HIGH_PTS[np.searchsorted(_PCT_FROM_HIGH_EDGES, pct_from_high)])
 
     # 2. RS Rating (25 pts max) - sweet spot is 85-94
     rs = stage_analysis['rs_rating']
-    if 85 <= rs <= 94:
-        score += 25
-    elif 80 <= rs <= 84:
-        score += 20
-    elif 75 <= rs <= 79:
-        score += 15
-    elif 70 <= rs <= 74:
-        score += 10
-    elif rs >= 95:
+    if rs >= 95:
         score += 10  # Penalized - likely overextended
+    else:
+        score += int(_RS_PTS[np.searchsorted(_RS_EDGES, rs, side='right')])
 
     # 3. Earnings Growth (25 pts max)
     eg = fundamentals.get('recent_earnings_growth')
     if eg is not None:
-        if eg > 100:
-            score += 25
-        elif eg > 50:
-            score += 20
-        elif eg > 25:
-            score += 15
-        elif eg > 15:
-            score += 10
-        else:
-            score += 5
+        score += int(_EARNINGS_GROWTH_PTS[np.searchsorted(_EARNINGS_GROWTH_EDGES, eg)])
 
     # 4. Revenue Growth (10 pts max)
     rg = fundamentals.get('recent_revenue_growth')
     if rg is not None:
-        if rg > 50:
-            score += 10
-        elif rg > 25:
-            score += 7
-        elif rg > 10:
-            score += 5
+        score += int(_REVENUE_GROWTH_PTS[np.searchsorted(_REVENUE_GROWTH_EDGES, rg)])
 
     # 5. Earnings/Revenue Acceleration (15 pts max combined)
     ea = fundamentals.get('earnings_acceleration_quarters', 0)
@@ -1310,7 +1751,11 @@ def main():
     print("\n" + "─" * 100)
     print("STEP 1: CALCULATING RELATIVE STRENGTH RATINGS")
     print("─" * 100)
-    print("\nDownloading S&P 500 (SPY) benchmark data...")
+    # Batch-download the benchmark together with the candidate universe
+    print(f"\nPrefetching price history for SPY + {len(stock_list)} stocks (batches of {PRICE_DOWNLOAD_BATCH})...")
+    prefetch_price_histories(["SPY"] + stock_list)
+
+    print("Loading S&P 500 (SPY) benchmark data...")
 
     try:
         spy_data = get_price_history("SPY", period="1y")
@@ -1331,51 +1776,56 @@ def main():
     # Analyze market regime (NEW)
     market_regime = analyze_market_regime(spy_data)
     print(f"MARKET REGIME: {market_regime['regime']}")
-    if market_regime['spy_price']:
+    if market_regime['spy_price'] is not None:
         print(f"  SPY: ${market_regime['spy_price']:.2f} | 50 MA: ${market_regime['spy_ma_50']:.2f} | 200 MA: ${market_regime['spy_ma_200']:.2f}")
     if market_regime['regime_warning']:
         print(f"  [!] WARNING: Market conditions not optimal for new positions\n")
     else:
         print(f"  Market healthy - full position sizes OK\n")
 
-    # Calculate RS for all stocks
-    print(f"Calculating RS ratings for {len(stock_list)} stocks...\n")
-    rs_results = []
+    # Extract the benchmark close series once for all RS calculations
+    spy_close = spy_data['Close'].to_numpy(dtype=np.float64)
 
-    for i, ticker in enumerate(stock_list, 1):
-        print(f"[{i}/{len(stock_list)}] Processing {ticker}...", end=" ")
+    # Calculate RS for all stocks, accumulating column-major
+    print(f"Calculating RS ratings for {len(stock_list)} stocks...\n")
+    rs_symbols = []
+    rs_scores = []
+    rs_returns = {'3mo': [], '6mo': [], '12mo': []}
+    rs_errors = []
 
-        rs_data, error = calculate_ibd_rs(ticker, spy_data)
+    progress = _ProgressPrinter(len(stock_list), "RS")
+    for ticker in stock_list:
+        rs_data, error = calculate_ibd_rs(ticker, spy_close)
 
+        rs_symbols.append(ticker)
         if rs_data:
-            rs_results.append({
-                'Symbol': ticker,
-                'RS Score': rs_data['rs_score'],
-                '3mo Return': rs_data['returns']['3mo'],
-                '6mo Return': rs_data['returns']['6mo'],
-                '12mo Return': rs_data['returns']['12mo'],
-                'Error': None
-            })
-            print("✓")
+            rs_scores.append(rs_data['rs_score'])
+            for period in rs_returns:
+                rs_returns[period].append(rs_data['returns'][period])
+            rs_errors.append(None)
+            progress.step(ticker, "✓")
         else:
-            rs_results.append({
-                'Symbol': ticker,
-                'RS Score': None,
-                '3mo Return': None,
-                '6mo Return': None,
-                '12mo Return': None,
-                'Error': error
-            })
-            print(f"✗ ({error})")
-
-    # Calculate RS Rating (percentile rank)
-    df_rs = pd.DataFrame(rs_results)
-    df_rs['RS Rating'] = np.nan
-    valid_mask = df_rs['RS Score'].notna()
-    if len(df_rs.loc[valid_mask]) > 0:
-        percentile_ranks = df_rs.loc[valid_mask, 'RS Score'].rank(pct=True, method='max')
-        rs_ratings = np.ceil(percentile_ranks * 99).clip(lower=1, upper=99).astype(int)
-        df_rs.loc[valid_mask, 'RS Rating'] = rs_ratings
+            rs_scores.append(None)
+            for period in rs_returns:
+                rs_returns[period].append(None)
+            rs_errors.append(error)
+            progress.step(ticker, f"✗ ({error})")
+    progress.close()
+
+    # Build the frame in one shot: each column is its own contiguous block
+    df_rs = pd.DataFrame({
+        'Symbol': rs_symbols,
+        'RS Score': np.array(rs_scores, dtype=np.float64),
+        '3mo Return': np.array(rs_returns['3mo'], dtype=np.float64),
+        '6mo Return': np.array(rs_returns['6mo'], dtype=np.float64),
+        '12mo Return': np.array(rs_returns['12mo'], dtype=np.float64),
+        'Error': rs_errors
+    })
+
+    # Calculate RS Rating (percentile rank); NaN scores stay NaN
+    df_rs['RS Rating'] = np.ceil(
+        df_rs['RS Score'].rank(pct=True, method='max') * 99
+    ).clip(lower=1, upper=99)
 
     # Filter stocks by RS rating
     high_rs_stocks = df_rs[df_rs['RS Rating'] >= MIN_RS_RATING].sort_values(by='RS Rating', ascending=False)
@@ -1398,25 +1848,29 @@ def main():
 
     stage_results = []
 
-    for i, (_, row) in enumerate(high_rs_stocks.iterrows(), 1):
-        ticker = row['Symbol']
-        rs_rating = row['RS Rating']
-
-        print(f"[{i}/{len(high_rs_stocks)}] Analyzing {ticker} (RS={rs_rating})...", end=" ")
+    # Pull the columns out once instead of allocating a Series per row
+    high_rs_rows = zip(
+        high_rs_stocks['Symbol'].tolist(),
+        high_rs_stocks['RS Rating'].tolist(),
+        high_rs_stocks['RS Score'].tolist()
+    )
 
+    progress = _ProgressPrinter(len(high_rs_stocks), "Stage")
+    for ticker, rs_rating, rs_score in high_rs_rows:
         analysis, error = analyze_stage(ticker, rs_rating)
 
         if analysis:
             stage_results.append({
                 'ticker': ticker,
-                'rs_score': row['RS Score'],
+                'rs_score': rs_score,
                 'analysis': analysis
             })
             stage = analysis['stage']
             status = "✓ STAGE 2" if analysis['passes_all_criteria'] else f"Stage {stage}"
-            print(status)
+            progress.step(f"{ticker} (RS={rs_rating})", status)
         else:
-            print(f"✗ ({error})")
+            progress.step(f"{ticker} (RS={rs_rating})", f"✗ ({error})")
+    progress.close()
 
     stage_2_stocks = [r for r in stage_results if r['analysis']['passes_all_criteria']]
 
@@ -1434,12 +1888,14 @@ def main():
         print(f"\nAnalyzing fundamentals for {len(stage_2_stocks)} Stage 2 stocks...")
         print("Checking: YoY acceleration, growth consistency, margins, and volatility\n")
 
+        print(f"Prefetching fundamentals with {MAX_FETCH_WORKERS} workers...")
+        prefetch_fundamentals([r['ticker'] for r in stage_2_stocks])
+
         sepa_results = []
 
-        for i, result in enumerate(stage_2_stocks, 1):
+        progress = _ProgressPrinter(len(stage_2_stocks), "Fundamentals")
+        for result in stage_2_stocks:
             ticker = result['ticker']
-            print(f"[{i}/{len(stage_2_stocks)}] {ticker}...", end=" ")
-
             fundamentals, error = analyze_fundamentals(ticker)
 
             if fundamentals:
@@ -1447,11 +1903,12 @@ def main():
                 sepa_results.append(result)
 
                 if fundamentals['passes_step2']:
-                    print("✓ SEPA QUALIFIED")
+                    progress.step(ticker, "✓ SEPA QUALIFIED")
                 else:
-                    print(f"✗ ({fundamentals['failed_criteria'][0]})")
+                    progress.step(ticker, f"✗ ({fundamentals['failed_criteria'][0]})")
             else:
-                print(f"✗ ({error})")
+                progress.step(ticker, f"✗ ({error})")
+        progress.close()
 
         sepa_qualified = [r for r in sepa_results if r['fundamentals']['passes_step2']]
 
@@ -1469,9 +1926,7 @@ def main():
         print(f"  • {len(stage_2_stocks) - len(sepa_qualified)} stocks filtered out (~{(len(stage_2_stocks) - len(sepa_qualified))/len(stage_2_stocks)*100:.0f}% rejection rate)")
 
         # Count by grade
-        grade_counts = {'A': 0, 'B': 0, 'C': 0, 'D': 0}
-        for r in sepa_qualified:
-            grade_counts[r['grade']] += 1
+        grade_counts = Counter(r['grade'] for r in sepa_qualified)
         print(f"  Quality Grades: A={grade_counts['A']}, B={grade_counts['B']}, C={grade_counts['C']}, D={grade_counts['D']}")
 
         stage_2_stocks = sepa_results  # Update to include fundamental data
@@ -1485,9 +1940,12 @@ def main():
         print("-" * 100)
         print(f"\nAnalyzing {len(sepa_qualified)} SEPA qualified stocks for entry timing...\n")
 
-        for i, result in enumerate(sepa_qualified, 1):
+        print(f"Prefetching entry/volume/earnings data with {MAX_FETCH_WORKERS} workers...")
+        prefetch_enhanced_data([r['ticker'] for r in sepa_qualified])
+
+        progress = _ProgressPrinter(len(sepa_qualified), "Enhanced")
+        for result in sepa_qualified:
             ticker = result['ticker']
-            print(f"[{i}/{len(sepa_qualified)}] {ticker}...", end=" ")
 
             # Get fresh price data for entry/volume analysis
             try:
@@ -1515,14 +1973,15 @@ def main():
                 entry_status = entry_data['entry_status'] if entry_data else "N/A"
                 vol_status = volume_data['volume_status'] if volume_data else "N/A"
                 earn_flag = earnings_data['earnings_flag']
-                print(f"{entry_status} | Vol:{vol_status} | Earn:{earn_flag} | {sector}")
+                progress.step(ticker, f"{entry_status} | Vol:{vol_status} | Earn:{earn_flag} | {sector}")
 
             except Exception as e:
-                print(f"Error: {e}")
+                progress.step(ticker, f"Error: {e}")
                 result['entry'] = None
                 result['volume'] = None
                 result['earnings'] = {'earnings_flag': 'UNKNOWN', 'days_until_earnings': None, 'next_earnings_date': None}
                 result['sector'] = 'Unknown'
+        progress.close()
 
         # Calculate sector concentration
         sector_analysis = calculate_sector_concentration(sepa_qualified)
@@ -1539,7 +1998,7 @@ def main():
 
     # Market Status Header
     print(f"\nMARKET STATUS: {market_regime['regime']}")
-    if market_regime['spy_price']:
+    if market_regime['spy_price'] is not None:
         above_50 = "Above" if market_regime['spy_price'] > market_regime['spy_ma_50'] else "Below"
         above_200 = "Above" if market_regime['spy_price'] > market_regime['spy_ma_200'] else "Below"
         print(f"  SPY: ${market_regime['spy_price']:.2f} | {above_50} 50 MA (${market_regime['spy_ma_50']:.2f}) | {above_200} 200 MA (${market_regime['spy_ma_200']:.2f})")
@@ -1572,17 +2031,7 @@ def main():
             print(f"  {'-'*8} {'-'*6} {'-'*4} {'-'*10} {'-'*10} {'-'*8} {'-'*10} {'-'*15}")
 
             for r in top_picks:
-                ticker = r['ticker']
-                grade = r.get('grade', '?')
-                rs = r['analysis']['rs_rating']
-                price = r['analysis']['current_price']
-                entry = r.get('entry', {}).get('entry_status', 'N/A')
-                volume = r.get('volume', {}).get('volume_status', 'N/A')
-                earn = r.get('earnings', {})
-                earn_str = format_earnings_display(earn)
-                sector = r.get('sector', 'Unknown')[:15]
-
-                print(f"  {ticker:<8} {grade:<6} {rs:<4} ${price:<9.2f} {entry:<10} {volume:<8} {earn_str:<10} {sector:<15}")
+                print(_format_pick_row(r))
 
         # WATCHLIST Section - Extended or earnings soon
         watchlist = [r for r in sepa_qualified if r not in top_picks]
@@ -1595,17 +2044,7 @@ def main():
             print(f"  {'-'*8} {'-'*6} {'-'*4} {'-'*10} {'-'*10} {'-'*8} {'-'*10} {'-'*15}")
 
             for r in watchlist:
-                ticker = r['ticker']
-                grade = r.get('grade', '?')
-                rs = r['analysis']['rs_rating']
-                price = r['analysis']['current_price']
-                entry = r.get('entry', {}).get('entry_status', 'N/A')
-                volume = r.get('volume', {}).get('volume_status', 'N/A')
-                earn = r.get('earnings', {})
-                earn_str = format_earnings_display(earn)
-                sector = r.get('sector', 'Unknown')[:15]
-
-                print(f"  {ticker:<8} {grade:<6} {rs:<4} ${price:<9.2f} {entry:<10} {volume:<8} {earn_str:<10} {sector:<15}")
+                print(_format_pick_row(r))
 
         # Sector Concentration
         if sector_analysis:
@@ -1621,10 +2060,7 @@ def main():
     print("SUMMARY")
     print("-" * 100)
 
-    stage_counts = {}
-    for r in stage_results:
-        stage = r['analysis']['stage']
-        stage_counts[stage] = stage_counts.get(stage, 0) + 1
+    stage_counts = Counter(r['analysis']['stage'] for r in stage_results)
 
     print(f"  Stage 2 (Buyable):       {stage_counts.get(2, 0)} stocks")
 
@@ -1727,28 +2163,25 @@ def main():
 
         csv_data.append(row_data)
 
-    df_output = pd.DataFrame(csv_data)
+    df_output = pd.DataFrame.from_records(csv_data)
     # Sort by Quality Score (if available), then SEPA status, then RS Rating
     sort_cols = ['Quality_Score', 'SEPA_Qualified', 'RS_Rating'] if 'Quality_Score' in df_output.columns else ['Stage_2_Confirmed', 'RS_Rating']
     df_output = df_output.sort_values(sort_cols, ascending=[False] * len(sort_cols))
 
-    filename = f"superperform_{timestamp}.csv"
-    df_output.to_csv(filename, index=False)
+    filename = _save_results_frame(df_output, "superperform", timestamp)
     print(f"\n✓ Results saved to: {filename}")
 
     # Save SEPA qualified stocks separately
     if ENABLE_STEP2 and len(sepa_qualified) > 0:
-        sepa_filename = f"sepa_qualified_{timestamp}.csv"
         df_sepa = df_output[df_output['SEPA_Qualified'] == True].copy()
-        df_sepa.to_csv(sepa_filename, index=False)
+        sepa_filename = _save_results_frame(df_sepa, "sepa_qualified", timestamp)
         print(f"✓ SEPA qualified stocks saved to: {sepa_filename}")
 
         # Save top picks separately (NEW)
         if len(top_picks) > 0:
             top_picks_tickers = [r['ticker'] for r in top_picks]
             df_top = df_sepa[df_sepa['Ticker'].isin(top_picks_tickers)].copy()
-            top_filename = f"top_picks_{timestamp}.csv"
-            df_top.to_csv(top_filename, index=False)
+            top_filename = _save_results_frame(df_top, "top_picks", timestamp)
             print(f"✓ Top picks saved to: {top_filename}")
 
     print("\n" + "=" * 100)